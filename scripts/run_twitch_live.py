@@ -8,8 +8,84 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.insert(0, project_root)
 
 from src.open_llm_vtuber.live.twitch_live import TwitchLivePlatform
+from src.open_llm_vtuber.config_manager import LiveConfig
 from src.open_llm_vtuber.config_manager.utils import read_yaml, validate_config
 
+# Bump when the layout of the cached data changes so stale sidecars are ignored
+CONFIG_CACHE_VERSION = 2
+
+
+def _config_cache_header(config_path: str) -> str:
+    """
+    Build the first line of the config cache sidecar from the stat of the config file.
+
+    Args:
+        config_path: Path to the YAML configuration file
+
+    Returns:
+        str: Header line keyed on format version, mtime and size
+    """
+    stat = os.stat(config_path)
+    return f"# stat: v{CONFIG_CACHE_VERSION}:{stat.st_mtime_ns}:{stat.st_size}\n"
+
+
+def load_live_config_cached(config_path: str) -> LiveConfig:
+    """
+    Load the validated live configuration, reusing a JSON sidecar when the file is unchanged.
+
+    The sidecar (``<config>.cache.json``) starts with a stat header line followed by
+    the already validated live config as JSON, so a warm start skips both YAML
+    parsing and full config validation. It is skipped for configs that reference
+    environment variables, since the substituted values would be frozen on disk.
+
+    Args:
+        config_path: Path to the YAML configuration file
+
+    Returns:
+        LiveConfig: Live streaming platforms configuration
+    """
+    cache_path = f"{config_path}.cache.json"
+    header = None
+
+    try:
+        header = _config_cache_header(config_path)
+        with open(cache_path, "r", encoding="utf-8") as f:
+            if f.readline() == header:
+                return LiveConfig.model_validate_json(f.read())
+    except (OSError, ValueError):
+        pass
+
+    # read_yaml reports a missing or unreadable config file
+    live_config = validate_config(read_yaml(config_path)).live_config
+    if header is None:
+        return live_config
+
+    with open(config_path, "rb") as f:
+        uses_env_vars = b"${" in f.read()
+    if uses_env_vars:
+        return live_config
+
+    # The cached live config holds credentials (OAuth token, SESSDATA cookie), so the
+    # sidecar is owner-only; remove any old copy so it is recreated with that mode
+    try:
+        os.remove(cache_path)
+    except OSError:
+        pass
+
+    try:
+        fd = os.open(cache_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(header)
+            f.write(live_config.model_dump_json(by_alias=True))
+    except (OSError, ValueError) as e:
+        logger.debug(f"Could not write config cache {cache_path}: {e}")
+        try:
+            os.remove(cache_path)
+        except OSError:
+            pass
+
+    return live_config
+
 
 async def main():
     """
@@ -21,11 +97,10 @@ async def main():
     try:
         # Load configuration
         config_path = os.path.join(project_root, "conf.yaml")
-        config_data = read_yaml(config_path)
-        config = validate_config(config_data)
+        live_config = load_live_config_cached(config_path)
 
         # Extract Twitch Live configuration
-        twitch_config = config.live_config.twitch_live
+        twitch_config = live_config.twitch_live
 
         # Check if channel is provided
         if not twitch_config.channel:
@@ -47,7 +122,7 @@ async def main():
 
     except ImportError as e:
         logger.error(f"Failed to import required modules: {e}")
-        logger.error("Make sure you have installed websocket-client with: pip install websocket-client")
+        logger.error("Make sure you have installed websockets with: pip install websockets")
     except Exception as e:
         logger.error(f"Error starting Twitch Live client: {e}")
         import traceback
@@ -1,4 +1,5 @@
-from typing import AsyncIterator, List, Dict, Any
+import threading
+from typing import TYPE_CHECKING, AsyncIterator, ClassVar, List, Dict, Any, Tuple
 from .agent_interface import AgentInterface
 from ..output_types import SentenceOutput
 from ..transformers import (
@@ -9,7 +10,24 @@ from ..transformers import (
 )
 from ...config_manager import TTSPreprocessorConfig
 from ..input_types import BatchInput, TextSource
-from letta_client import Letta
+
+if TYPE_CHECKING:
+    from letta_client import AsyncLetta
+
+# Metadata message types in the Letta stream that carry no reply text
+_SKIP_TYPES = frozenset({"stop_reason", "usage_statistics", "reasoning_message"})
+
+_CLIP_FMT = "[Clipboard content: {}]".format
+
+
+def _content_text(content) -> str:
+    """
+    Extract the text of a Letta message content field, which is either a
+    plain string or a list of content parts.
+    """
+    if isinstance(content, str):
+        return content
+    return "".join(getattr(part, "text", None) or "" for part in content)
 
 
 class LettaAgent(AgentInterface):
@@ -17,6 +35,10 @@ class LettaAgent(AgentInterface):
     Custom Letta class to interface with the Letta server.
     """
 
+    # Clients shared by all agents talking to the same server, keyed by (base_url, token)
+    _client_cache: ClassVar[Dict[Tuple[str, str], "AsyncLetta"]] = {}
+    _client_cache_lock: ClassVar[threading.Lock] = threading.Lock()
+
     def __init__(
         self,
         live2d_model,
@@ -27,7 +49,7 @@ class LettaAgent(AgentInterface):
         host: str = "localhost",
         port: int = 8283,
         letta_cloud_api_key: str = None,
-        token_streaming: bool = False,
+        token_streaming: bool = True,
     ):
         super().__init__()
         self.id = id
@@ -36,11 +58,11 @@ class LettaAgent(AgentInterface):
         # Initialize Letta client based on whether cloud API key is provided
         if letta_cloud_api_key:
             # Use Letta Cloud with API key
-            self.client = Letta(base_url="https://api.letta.com", token=letta_cloud_api_key)
+            self.client = self._get_client("https://api.letta.com", letta_cloud_api_key)
         else:
             # Use local Letta server
             self.url = f"http://{host}:{port}"
-            self.client = Letta(base_url=self.url)
+            self.client = self._get_client(self.url)
         # Initialize decorator parameters
         self._tts_preprocessor_config = tts_preprocessor_config
         self._live2d_model = live2d_model
@@ -60,6 +82,32 @@ class LettaAgent(AgentInterface):
             )
         )
 
+    @classmethod
+    def _get_client(cls, base_url: str, token: str = None) -> "AsyncLetta":
+        """
+        Return the shared Letta client for a server, creating it on first use.
+
+        Args:
+            base_url: str - URL of the Letta server
+            token: str - API token, if the server requires one
+
+        Returns:
+            AsyncLetta - Client reusing one connection pool per server and token
+        """
+        # Imported here so that importing this module does not pull in the Letta SDK
+        from letta_client import AsyncLetta
+
+        key = (base_url, token or "")
+        with cls._client_cache_lock:
+            client = cls._client_cache.get(key)
+            if client is None:
+                if token:
+                    client = AsyncLetta(base_url=base_url, token=token)
+                else:
+                    client = AsyncLetta(base_url=base_url)
+                cls._client_cache[key] = client
+        return client
+
     def set_memory_from_history(self, conf_uid: str, history_uid: str) -> None:
         # The Letta Server automatically stores historical messages, so this part is not needed
         pass
@@ -67,33 +115,32 @@ class LettaAgent(AgentInterface):
     def handle_interrupt(self, heard_response: str) -> None:
         pass
 
-    async def generator_to_async(self, gen):
-        for item in gen:
-            yield item
-
     async def chat(self, input_data: BatchInput) -> AsyncIterator[SentenceOutput]:
         messages = self._to_messages(input_data)
         
         try:
-            # Use Letta Cloud streaming with configurable token streaming
-            stream = self.generator_to_async(
-                self.client.agents.messages.create_stream(
-                    agent_id=self.id,
-                    messages=messages,
-                    stream_tokens=self.token_streaming,
-                )
+            # With token streaming, each assistant_message carries only the new delta,
+            # so the sentence divider can start TTS before the full reply is generated
+            stream = self.client.agents.messages.create_stream(
+                agent_id=self.id,
+                messages=messages,
+                stream_tokens=self.token_streaming,
             )
 
             complete_response = ""
             async for token in stream:
                 # Handle different token types
-                if hasattr(token, 'message_type'):
+                msg_type = getattr(token, "message_type", None)
+                if msg_type is not None:
                     # Skip metadata tokens
-                    if token.message_type in ["stop_reason", "usage_statistics", "reasoning_message"]:
+                    if msg_type in _SKIP_TYPES:
                         continue
-                    elif token.message_type == "assistant_message" and hasattr(token, 'content') and token.content:
-                        yield token.content
-                        complete_response += token.content
+                    if msg_type == "assistant_message":
+                        content = getattr(token, "content", None)
+                        delta = _content_text(content) if content else ""
+                        if delta:
+                            yield delta
+                            complete_response += delta
                 elif isinstance(token, str):
                     # Direct string tokens from Letta streaming
                     yield token
@@ -104,7 +151,7 @@ class LettaAgent(AgentInterface):
             logger.error(f"Error in Letta streaming: {e}")
             # Fallback to non-streaming
             try:
-                response = self.client.agents.messages.create(
+                response = await self.client.agents.messages.create(
                     agent_id=self.id,
                     messages=messages,
                 )
@@ -117,7 +164,7 @@ class LettaAgent(AgentInterface):
                         )
                         
                         if is_assistant and hasattr(msg, 'content') and msg.content:
-                            yield msg.content
+                            yield _content_text(msg.content)
                             
             except Exception as fallback_error:
                 logger.error(f"Fallback non-streaming also failed: {fallback_error}")
@@ -133,31 +180,20 @@ class LettaAgent(AgentInterface):
         Returns:
             str - Formatted message string
         """
-        message_parts = []
-
-        # Process text inputs in order
-        for text_data in input_data.texts:
-            if text_data.source == TextSource.INPUT:
-                message_parts.append(text_data.content)
-            elif text_data.source == TextSource.CLIPBOARD:
-                message_parts.append(f"[Clipboard content: {text_data.content}]")
-
-        return "\n".join(message_parts)
+        # Process text inputs in order; anything not typed or spoken is clipboard text
+        return "\n".join(
+            text_data.content
+            if text_data.source == TextSource.INPUT
+            else _CLIP_FMT(text_data.content)
+            for text_data in input_data.texts
+        )
 
     def _to_messages(self, input_data: BatchInput) -> List[Dict[str, Any]]:
         """
         Prepare messages list without image support.
         """
-        messages = []
-
         if input_data.images:
-            content = []
-            text_content = self._to_text_prompt(input_data)
-            content.append({"type": "text", "text": text_content})
-            user_message = {"role": "user", "content": content}
-        else:
-            user_message = {"role": "user", "content": self._to_text_prompt(input_data)}
-
-        messages.append(user_message)
+            content = [{"type": "text", "text": self._to_text_prompt(input_data)}]
+            return [{"role": "user", "content": content}]
 
-        return messages
+        return [{"role": "user", "content": self._to_text_prompt(input_data)}]
@@ -157,6 +157,7 @@ class LettaConfig(I18nMixin, BaseModel):
     letta_cloud_api_key: Optional[str] = Field(None, alias="letta_cloud_api_key")
     faster_first_response: Optional[bool] = Field(True, alias="faster_first_response")
     segment_method: Literal["regex", "pysbd"] = Field("pysbd", alias="segment_method")
+    token_streaming: bool = Field(True, alias="token_streaming")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "host": Description(
@@ -182,6 +183,10 @@ class LettaConfig(I18nMixin, BaseModel):
             en="Method for segmenting sentences: 'regex' or 'pysbd' (default: 'pysbd')",
             zh="分割句子的方法：'regex' 或 'pysbd'（默认：'pysbd'）",
         ),
+        "token_streaming": Description(
+            en="Stream the reply token by token to reduce first-sentence latency (default: True)",
+            zh="逐 token 流式返回回复以减少首句延迟（默认：True）",
+        ),
     }
 
 
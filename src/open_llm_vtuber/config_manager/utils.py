@@ -12,6 +12,12 @@ from .main import Config
 
 T = TypeVar("T", bound=BaseModel)
 
+# Prefer the libyaml-backed loader; fall back when PyYAML was built without it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 
 def read_yaml(config_path: str) -> Dict[str, Any]:
     """
@@ -46,7 +52,7 @@ def read_yaml(config_path: str) -> Dict[str, Any]:
     content = pattern.sub(replacer, content)
 
     try:
-        return yaml.safe_load(content)
+        return yaml.load(content, Loader=SafeLoader)
     except yaml.YAMLError as e:
         logger.critical(f"Error parsing YAML file: {e}")
         raise e
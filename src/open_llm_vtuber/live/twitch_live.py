@@ -2,18 +2,101 @@ import asyncio
 import json
 import re
 import traceback
-from typing import Callable, Dict, Any, List, Optional
+from enum import Enum
+from typing import TYPE_CHECKING, Callable, Dict, Any, List, Optional, Tuple
 from loguru import logger
-import websockets
 
 from .live_interface import LivePlatformInterface
 
+if TYPE_CHECKING:
+    import websockets
+
+# orjson is optional; it is much faster on the large audio payloads from the proxy
 try:
-    import websocket
-    WEBSOCKET_CLIENT_AVAILABLE = True
+    import orjson
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    _json_loads = orjson.loads
 except ImportError:
-    logger.warning("websocket-client library required for Twitch integration")
-    WEBSOCKET_CLIENT_AVAILABLE = False
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+# Read-only login Twitch accepts without an OAuth token
+ANONYMOUS_USERNAME = "justinfan12345"
+
+# :user!user@user.tmi.twitch.tv PRIVMSG #channel :message
+_PRIVMSG_RE = re.compile(r":(\w+)!\S*\s+PRIVMSG\s+#\S+\s+:(.+)")
+
+# Parse PRIVMSG lines with _PRIVMSG_RE instead of the str.find based fast path
+USE_REGEX_IRC_PARSER = False
+
+# Envelope prefixes of audio messages relayed by the proxy (compact and default separators)
+_AUDIO_MESSAGE_PREFIXES = ('{"type":"audio"', '{"type": "audio"')
+
+# Chat messages buffered between the IRC reader and the proxy forwarder
+CHAT_QUEUE_MAXSIZE = 256
+
+
+# IRCv3 tag value escapes: "\:" is ";", "\s" is a space, "\\" is a backslash
+_IRC_TAG_UNESCAPES = {":": ";", "s": " ", "\\": "\\", "r": "\r", "n": "\n"}
+
+
+def _unescape_irc_tag_value(value: str) -> str:
+    """
+    Undo IRCv3 message tag value escaping.
+
+    Args:
+        value: Escaped tag value
+
+    Returns:
+        str: Unescaped tag value
+    """
+    if "\\" not in value:
+        return value
+
+    chars = []
+    i = 0
+    while i < len(value):
+        char = value[i]
+        if char == "\\":
+            i += 1
+            # A trailing lone backslash is dropped; unknown escapes keep the character
+            if i < len(value):
+                chars.append(_IRC_TAG_UNESCAPES.get(value[i], value[i]))
+        else:
+            chars.append(char)
+        i += 1
+    return "".join(chars)
+
+
+def _irc_tag_value(tags: str, key: str) -> str:
+    """
+    Get the value of an IRCv3 message tag.
+
+    Args:
+        tags: Raw tag block without the leading '@', e.g. "color=#FF0000;display-name=Foo"
+        key: Tag name to look up
+
+    Returns:
+        str: Unescaped tag value, or an empty string if the tag is missing
+    """
+    tags = f";{tags}"
+    start = tags.find(f";{key}=")
+    if start < 0:
+        return ""
+    start += len(key) + 2
+    end = tags.find(";", start)
+    return _unescape_irc_tag_value(tags[start:] if end < 0 else tags[start:end])
+
+
+class HandlerMode(Enum):
+    """How a registered message handler is invoked"""
+
+    SYNC = 1  # Called directly on the event loop
+    CORO = 2  # Awaited as a coroutine
+    THREAD = 3  # Run in a worker thread; registered with run_in_thread=True
 
 
 class TwitchLivePlatform(LivePlatformInterface):
@@ -31,17 +114,21 @@ class TwitchLivePlatform(LivePlatformInterface):
             oauth_token: OAuth token for authentication (optional for read-only)
             username: Username for the bot (optional for read-only)
         """
-        if not WEBSOCKET_CLIENT_AVAILABLE:
-            raise ImportError("websocket-client library is required for Twitch functionality")
+        import websockets
+
+        self._websockets = websockets
 
         self._channel = channel.lower().lstrip('#')
         self._oauth_token = oauth_token
-        self._username = username.lower() if username else "justinfan12345"
-        self._websocket: Optional[websockets.WebSocketClientProtocol] = None
-        self._irc_socket: Optional[websocket.WebSocket] = None
+        self._username = username.lower() if username else ANONYMOUS_USERNAME
+        self._websocket: Optional["websockets.WebSocketClientProtocol"] = None
+        self._irc_ws: Optional["websockets.WebSocketClientProtocol"] = None
         self._connected = False
         self._running = False
-        self._message_handlers: List[Callable[[Dict[str, Any]], None]] = []
+        self._message_handlers: List[
+            Tuple[Callable[[Dict[str, Any]], None], HandlerMode]
+        ] = []
+        self._chat_queue: asyncio.Queue = asyncio.Queue(maxsize=CHAT_QUEUE_MAXSIZE)
 
     @property
     def is_connected(self) -> bool:
@@ -69,7 +156,7 @@ class TwitchLivePlatform(LivePlatformInterface):
             bool: True if connection successful
         """
         try:
-            self._websocket = await websockets.connect(
+            self._websocket = await self._websockets.connect(
                 proxy_url, ping_interval=20, ping_timeout=10, close_timeout=5
             )
             self._connected = True
@@ -86,10 +173,10 @@ class TwitchLivePlatform(LivePlatformInterface):
         self._running = False
 
         # Close Twitch IRC connection
-        if self._irc_socket:
+        if self._irc_ws:
             try:
-                self._irc_socket.close()
-                self._irc_socket = None
+                await self._irc_ws.close()
+                self._irc_ws = None
             except Exception as e:
                 logger.warning(f"Error while closing Twitch IRC socket: {e}")
 
@@ -113,13 +200,13 @@ class TwitchLivePlatform(LivePlatformInterface):
         Returns:
             bool: True if sent successfully
         """
-        if not self._irc_socket or not self._oauth_token:
+        if not self._irc_ws or not self._oauth_token:
             logger.warning("Cannot send message: No IRC connection or OAuth token")
             return False
 
         try:
             message = f"PRIVMSG #{self._channel} :{text}\r\n"
-            self._irc_socket.send(message)
+            await self._irc_ws.send(message)
             logger.info(f"Sent message to Twitch chat: {text}")
             return True
         except Exception as e:
@@ -127,18 +214,29 @@ class TwitchLivePlatform(LivePlatformInterface):
             return False
 
     async def register_message_handler(
-        self, handler: Callable[[Dict[str, Any]], None]
+        self, handler: Callable[[Dict[str, Any]], None], run_in_thread: bool = False
     ) -> None:
         """
         Register a callback for handling incoming messages.
 
+        Coroutine functions are awaited and plain functions are called directly
+        on the event loop, so a plain function that blocks must be registered
+        with run_in_thread=True.
+
         Args:
             handler: Function to call when a message is received
+            run_in_thread: Run a plain-function handler in a worker thread
         """
-        self._message_handlers.append(handler)
+        if asyncio.iscoroutinefunction(handler):
+            mode = HandlerMode.CORO
+        elif run_in_thread:
+            mode = HandlerMode.THREAD
+        else:
+            mode = HandlerMode.SYNC
+        self._message_handlers.append((handler, mode))
         logger.debug("Registered new message handler")
 
-    def _connect_to_twitch_irc(self) -> bool:
+    async def _connect_to_twitch_irc(self) -> bool:
         """
         Connect to Twitch IRC server.
 
@@ -146,21 +244,23 @@ class TwitchLivePlatform(LivePlatformInterface):
             bool: True if connection successful
         """
         try:
-            self._irc_socket = websocket.create_connection("wss://irc-ws.chat.twitch.tv:443")
+            self._irc_ws = await self._websockets.connect("wss://irc-ws.chat.twitch.tv:443")
             
             # Send authentication if token provided
             if self._oauth_token and not self._oauth_token.startswith("oauth:"):
                 oauth_token = f"oauth:{self._oauth_token}"
             else:
-                oauth_token = self._oauth_token
-
-            if oauth_token:
-                self._irc_socket.send(f"PASS {oauth_token}\r\n")
-            else:
-                self._irc_socket.send(f"PASS oauth:anonymous\r\n")
-            
-            self._irc_socket.send(f"NICK {self._username}\r\n")
-            self._irc_socket.send(f"JOIN #{self._channel}\r\n")
+                oauth_token = self._oauth_token or "oauth:anonymous"
+
+            # Send the whole handshake in one frame; the tags capability gives us
+            # the sender's display name without parsing the hostmask
+            handshake = (
+                "CAP REQ :twitch.tv/tags\r\n"
+                f"PASS {oauth_token}\r\n"
+                f"NICK {self._username}\r\n"
+                f"JOIN #{self._channel}\r\n"
+            )
+            await self._irc_ws.send(handshake)
             
             logger.info(f"Connected to Twitch IRC for channel #{self._channel}")
             return True
@@ -179,27 +279,88 @@ class TwitchLivePlatform(LivePlatformInterface):
             Optional[str]: Chat message text or None
         """
         try:
-            # Parse PRIVMSG format: :user!user@user.tmi.twitch.tv PRIVMSG #channel :message
-            if "PRIVMSG" in message:
-                # Extract username and message using regex
-                match = re.match(r":(\w+)!.*PRIVMSG #\w+ :(.+)", message)
+            # Skip PING/JOIN/CAP and other non-chat lines before parsing
+            if " PRIVMSG " not in message:
+                return None
+
+            # @tags :user!user@user.tmi.twitch.tv PRIVMSG #channel :message
+            display_name = ""
+            if message.startswith("@"):
+                tags_end = message.find(" ", 1)
+                if tags_end < 0:
+                    return None
+                display_name = _irc_tag_value(message[1:tags_end], "display-name")
+                message = message[tags_end + 1 :]
+
+            if USE_REGEX_IRC_PARSER:
+                match = _PRIVMSG_RE.match(message)
                 if match:
                     username, chat_message = match.groups()
-                    return f"{username}: {chat_message.strip()}"
-            return None
+                    return f"{display_name or username}: {chat_message.strip()}"
+                return None
+
+            # Slice out nick and text by offset; the PRIVMSG grammar is fixed.
+            # The command must directly follow the prefix, so text such as
+            # "... USERNOTICE #c :hi PRIVMSG #c :x" is not taken for chat.
+            if not message.startswith(":"):
+                return None
+            priv = message.find(" ", 1)
+            if priv < 0 or not message.startswith(" PRIVMSG ", priv):
+                return None
+            colon = message.find(" :", priv + 9)
+            if colon < 0:
+                return None
+
+            chat_message = message[colon + 2 :].strip()
+            if not chat_message:
+                return None
+
+            # Fall back to the nick in the hostmask when tags are missing
+            if not display_name:
+                bang = message.find("!", 1, priv)
+                if bang < 0:
+                    return None
+                display_name = message[1:bang]
+            return f"{display_name}: {chat_message}"
         except Exception as e:
             logger.error(f"Error parsing IRC message: {e}")
             return None
 
-    async def _handle_chat_message(self, chat_text: str):
+    def _handle_chat_message(self, chat_text: str):
         """
-        Process received chat message and forward it to VTuber.
+        Queue received chat message for forwarding to VTuber.
+        The oldest queued message is dropped if the queue is full.
 
         Args:
             chat_text: The chat text received from Twitch
         """
         try:
-            await self._send_to_proxy(chat_text)
+            self._chat_queue.put_nowait(chat_text)
+        except asyncio.QueueFull:
+            dropped = self._chat_queue.get_nowait()
+            logger.warning(f"Chat queue full, dropping oldest message: {dropped}")
+            self._chat_queue.put_nowait(chat_text)
+
+    async def _proxy_forwarder(self):
+        """
+        Forward queued chat messages to the proxy.
+        Runs as its own task so a slow proxy does not stall IRC reads.
+        Messages that are already queued when one is picked up are sent
+        together as a single text-input, one chat message per line.
+        """
+        try:
+            logger.info("Started forwarding chat messages to proxy")
+            while self._running:
+                chat_texts = [await self._chat_queue.get()]
+                while True:
+                    try:
+                        chat_texts.append(self._chat_queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+                await self._send_to_proxy("\n".join(chat_texts))
+        except asyncio.CancelledError:
+            logger.info("Stopped forwarding chat messages to proxy")
+            raise
         except Exception as e:
             logger.error(f"Error forwarding chat message to proxy: {e}")
 
@@ -219,7 +380,7 @@ class TwitchLivePlatform(LivePlatformInterface):
 
         try:
             message = {"type": "text-input", "text": text}
-            await self._websocket.send(json.dumps(message))
+            await self._websocket.send(_json_dumps(message))
             logger.info(f"Sent chat message to VTuber: {text}")
             return True
         except Exception as e:
@@ -241,20 +402,38 @@ class TwitchLivePlatform(LivePlatformInterface):
             while self._running and self.is_connected:
                 try:
                     message = await self._websocket.recv()
-                    data = json.loads(message)
 
-                    # Log received message (truncate audio data for readability)
+                    # Audio messages carry large base64 payloads; don't decode them
+                    # when no handler is registered to consume them
+                    if (
+                        not self._message_handlers
+                        and isinstance(message, str)
+                        and message.startswith(_AUDIO_MESSAGE_PREFIXES)
+                    ):
+                        logger.debug(
+                            f"Received audio message from VTuber, length: {len(message)} (not decoded)"
+                        )
+                        continue
+
+                    data = _json_loads(message)
+
+                    # Log received message (summarize audio data for readability);
+                    # lazy arguments are only evaluated when debug logging is enabled
                     if "audio" in data:
-                        log_data = data.copy()
-                        log_data["audio"] = f"[Audio data, length: {len(data['audio'])}]"
-                        logger.debug(f"Received message from VTuber: {log_data}")
+                        logger.opt(lazy=True).debug(
+                            "Received message from VTuber: keys={} audio_len={}",
+                            lambda: list(data.keys()),
+                            lambda: len(data["audio"] or ""),
+                        )
                     else:
-                        logger.debug(f"Received message from VTuber: {data}")
+                        logger.opt(lazy=True).debug(
+                            "Received message from VTuber: {}", lambda: data
+                        )
 
                     # Process the message
                     await self.handle_incoming_messages(data)
 
-                except websockets.exceptions.ConnectionClosed:
+                except self._websockets.exceptions.ConnectionClosed:
                     logger.warning("WebSocket connection closed by server")
                     self._connected = False
                     break
@@ -274,9 +453,14 @@ class TwitchLivePlatform(LivePlatformInterface):
             message: The message received from the VTuber
         """
         # Process the message with all registered handlers
-        for handler in self._message_handlers:
+        for handler, mode in self._message_handlers:
             try:
-                await asyncio.to_thread(handler, message)
+                if mode is HandlerMode.SYNC:
+                    handler(message)
+                elif mode is HandlerMode.CORO:
+                    await handler(message)
+                else:
+                    await asyncio.to_thread(handler, message)
             except Exception as e:
                 logger.error(f"Error in message handler: {e}")
 
@@ -286,28 +470,41 @@ class TwitchLivePlatform(LivePlatformInterface):
         """
         try:
             logger.info(f"Started monitoring Twitch chat for #{self._channel}")
-            while self._running and self._irc_socket:
+            while self._running and self._irc_ws:
                 try:
                     # Receive IRC message
-                    response = self._irc_socket.recv()
+                    response = await self._irc_ws.recv()
                     
-                    # Handle multiple messages in one response
-                    for line in response.strip().split('\r\n'):
-                        if not line:
-                            continue
-                            
-                        # Handle PING/PONG to keep connection alive
-                        if line.startswith("PING"):
-                            pong_message = line.replace("PING", "PONG")
-                            self._irc_socket.send(f"{pong_message}\r\n")
-                            continue
-
-                        # Parse chat message
-                        chat_message = self._parse_irc_message(line)
-                        if chat_message:
-                            logger.debug(f"Received chat: {chat_message}")
-                            await self._handle_chat_message(chat_message)
-
+                    # Handle multiple messages in one response; IRC lines end with CRLF,
+                    # and chat text may itself contain other line-break characters
+                    lines = [line for line in response.split("\r\n") if line]
+
+                    # Answer every PING in the batch with a single write
+                    pongs = [
+                        line.replace("PING", "PONG", 1) + "\r\n"
+                        for line in lines
+                        if line.startswith("PING")
+                    ]
+                    if pongs:
+                        await self._irc_ws.send("".join(pongs))
+
+                    # Parse chat messages and queue them for the proxy forwarder
+                    chats = [
+                        chat
+                        for chat in (
+                            self._parse_irc_message(line)
+                            for line in lines
+                            if not line.startswith("PING")
+                        )
+                        if chat
+                    ]
+                    for chat_message in chats:
+                        logger.debug(f"Received chat: {chat_message}")
+                        self._handle_chat_message(chat_message)
+
+                except self._websockets.exceptions.ConnectionClosed:
+                    logger.warning("Twitch IRC connection closed by server")
+                    break
                 except Exception as e:
                     if self._running:
                         logger.error(f"Error monitoring Twitch chat: {e}")
@@ -335,24 +532,37 @@ class TwitchLivePlatform(LivePlatformInterface):
                 return
 
             # Connect to Twitch IRC
-            if not self._connect_to_twitch_irc():
+            if not await self._connect_to_twitch_irc():
                 logger.error("Failed to connect to Twitch IRC, exiting")
                 await self.disconnect()
                 return
 
-            # Start background task for receiving messages from the proxy
-            receive_task = asyncio.create_task(self.start_receiving())
-            
-            # Start monitoring Twitch chat
-            chat_task = asyncio.create_task(self._monitor_twitch_chat())
+            tasks = [
+                # Receive messages from the proxy
+                asyncio.create_task(self.start_receiving()),
+                # Monitor Twitch chat
+                asyncio.create_task(self._monitor_twitch_chat()),
+                # Forward queued chat messages to the proxy
+                asyncio.create_task(self._proxy_forwarder()),
+            ]
 
             logger.info(f"Connected to Twitch channel #{self._channel}")
 
-            # Wait for tasks to complete
+            # Run until any task stops; the others cannot do useful work on a
+            # half-closed connection, so they are cancelled rather than left running
             try:
-                await asyncio.gather(receive_task, chat_task)
+                done, _ = await asyncio.wait(
+                    tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if not task.cancelled() and task.exception():
+                        logger.error(f"Twitch Live task failed: {task.exception()}")
             except asyncio.CancelledError:
                 logger.info("Tasks cancelled")
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
 
         except KeyboardInterrupt:
             logger.info("Received keyboard interrupt, shutting down")